@@ -1,31 +1,83 @@
 # image_converter.py
 # quick and dirty script to convert images to RGB565 .raw files
 # Convert an image to BIG-ENDIAN RGB565 .raw for embedded-graphics ImageRaw::<Rgb565>
-# No flags, just click. Requires: pip install pillow
+# No args: just click through the file picker. Or: image_converter.py IMAGE... [--width W] [--height H]
+# Requires: pip install pillow numpy
+# Optional: pip install opencv-python (faster upscaling)
 
+import argparse
+import functools
 import os
-import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from PIL import Image
-import tkinter as tk
-from tkinter import filedialog, simpledialog, messagebox
+try:
+    import cv2
+except ImportError:
+    cv2 = None
 
-def to_rgb565_be_bytes(img: Image.Image) -> bytes:
-    """Convert an RGB image (exact size) to BIG-endian RGB565 raw bytes."""
-    if img.mode != "RGB":
+MAX_DIM = 4096  # output size bound, shared by the CLI flags and the GUI prompts
+
+def resize_rgb(img: Image.Image, w: int, h: int) -> np.ndarray:
+    """Stretch to exactly (w, h) as an (h, w, 3) uint8 array, using OpenCV for upscales if installed."""
+    rgb = img if img.mode == "RGB" else img.convert("RGB")  # skip the full-image copy when already RGB
+    iw, ih = rgb.size
+    # cv2's LANCZOS4 doesn't antialias when shrinking (moire vs PIL's flat result), so any
+    # downscale stays on PIL to keep the .raw output independent of whether OpenCV is installed
+    if cv2 is not None and w >= iw and h >= ih:
+        return cv2.resize(np.asarray(rgb), (w, h), interpolation=cv2.INTER_LANCZOS4)
+    return np.asarray(rgb.resize((w, h), Image.LANCZOS))
+
+def to_rgb565_be_bytes(img) -> bytes:
+    """Convert an RGB image or (h, w, 3) array (exact size) to BIG-endian RGB565 raw bytes."""
+    if isinstance(img, Image.Image) and img.mode != "RGB":
         img = img.convert("RGB")
-    w, h = img.size
-    px = img.load()
-    out = bytearray(w * h * 2)
-    i = 0
-    for y in range(h):
-        for x in range(w):
-            r, g, b = px[x, y]
-            v = ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
-            out[i:i+2] = struct.pack(">H", v)  # BIG-endian
-            i += 2
-    return bytes(out)
+    arr = np.asarray(img, dtype=np.uint8)
+    r = arr[..., 0].astype(np.uint16)
+    g = arr[..., 1].astype(np.uint16)
+    b = arr[..., 2].astype(np.uint16)
+    v = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+    return v.astype(">u2", copy=False).tobytes()  # BIG-endian, no-op copy on BE hosts
+
+def convert_file(path: str, w: int = None, h: int = None):
+    """Convert `path` to <base>_<W>x<H>_rgb565_be.raw next to it. Size defaults to the source size."""
+    with Image.open(path) as img:
+        iw, ih = img.size
+        w = w if w is not None else iw
+        h = h if h is not None else ih
+
+        # Stretch to exactly (w, h) (simple & predictable)
+        img2 = resize_rgb(img, w, h)
+
+    raw_bytes = to_rgb565_be_bytes(img2)
+    base, _ = os.path.splitext(path)
+    out_path = f"{base}_{w}x{h}_rgb565_be.raw"
+    with open(out_path, "wb") as f:
+        f.write(raw_bytes)
+    return out_path, len(raw_bytes), w * h * 2
+
+def _convert_safe(path: str, w: int = None, h: int = None):
+    try:
+        out_path, n, expected = convert_file(path, w, h)
+    except Exception as e:
+        return False, f"fail: {path}: {e}"
+    return True, f"ok: {out_path}  {n} bytes (expected {expected})"
+
+def _dim(s: str) -> int:
+    try:
+        n = int(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {s!r}")
+    if not 1 <= n <= MAX_DIM:
+        raise argparse.ArgumentTypeError(f"must be 1..{MAX_DIM}, got {n}")
+    return n
+
+def run_gui():
+    # Tk is only needed for the click-through flow; keep it out of CLI/headless runs
+    import tkinter as tk
+    from tkinter import filedialog, simpledialog, messagebox
 
-def main():
     root = tk.Tk()
     root.withdraw()
 
@@ -38,34 +90,48 @@ def main():
         return
 
     try:
-        img = Image.open(path)
+        with Image.open(path) as img:
+            iw, ih = img.size
     except Exception as e:
         messagebox.showerror("Error", f"Failed to open image:\n{e}")
         return
 
-    iw, ih = img.size
-    w = simpledialog.askinteger("Width", "Output width (pixels):", initialvalue=iw, minvalue=1, maxvalue=4096)
+    w = simpledialog.askinteger("Width", "Output width (pixels):", initialvalue=iw, minvalue=1, maxvalue=MAX_DIM)
     if w is None:
         return
-    h = simpledialog.askinteger("Height", "Output height (pixels):", initialvalue=ih, minvalue=1, maxvalue=4096)
+    h = simpledialog.askinteger("Height", "Output height (pixels):", initialvalue=ih, minvalue=1, maxvalue=MAX_DIM)
     if h is None:
         return
 
-    # Stretch to exactly (w, h) (simple & predictable)
-    img2 = img.convert("RGB").resize((w, h), Image.LANCZOS)
-
-    raw_bytes = to_rgb565_be_bytes(img2)
-    base, _ = os.path.splitext(path)
-    out_path = f"{base}_{w}x{h}_rgb565_be.raw"
-
     try:
-        with open(out_path, "wb") as f:
-            f.write(raw_bytes)
+        out_path, n, expected = convert_file(path, w, h)
     except Exception as e:
-        messagebox.showerror("Error", f"Failed to save file:\n{e}")
+        messagebox.showerror("Error", f"Failed to convert image:\n{e}")
+        return
+
+    messagebox.showinfo("Done", f"Saved:\n{out_path}\nBytes: {n} (expected {expected})")
+
+def main():
+    ap = argparse.ArgumentParser(description="Convert an image to BIG-endian RGB565 .raw (no args: file picker GUI)")
+    ap.add_argument("paths", nargs="*", help="input images; omit to pick one with the GUI")
+    ap.add_argument("--width", type=_dim, help=f"output width in pixels, 1..{MAX_DIM} (default: source width)")
+    ap.add_argument("--height", type=_dim, help=f"output height in pixels, 1..{MAX_DIM} (default: source height)")
+    args = ap.parse_args()
+
+    if not args.paths:
+        if args.width is not None or args.height is not None:
+            ap.error("--width/--height need at least one input image (the GUI asks for the size itself)")
+        run_gui()
         return
 
-    messagebox.showinfo("Done", f"Saved:\n{out_path}\nBytes: {len(raw_bytes)} (expected {w*h*2})")
+    # Images are independent and CPU-bound: one worker per core, print from here
+    job = functools.partial(_convert_safe, w=args.width, h=args.height)
+    ok = 0
+    with ProcessPoolExecutor() as ex:
+        for done, msg in ex.map(job, args.paths):
+            print(msg)
+            ok += done
+    sys.exit(0 if ok == len(args.paths) else 1)
 
 if __name__ == "__main__":
     main()
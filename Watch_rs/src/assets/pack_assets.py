@@ -1,56 +1,129 @@
 #!/usr/bin/env python3
 import argparse
+import functools
+import mmap
 import pathlib
-import re
 import sys
 import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    # Optional: pip install isal (ISA-L SIMD deflate, same zlib stream format)
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
 
 # python3 /home/ilikedogz/rust_test/rust_test_area/esp32s3_tests/src/assets/pack_assets.py -r -o
 
-# Match names like: alien1_240x240_rgb565_be.raw
-RAW_RE = re.compile(r'_(\d+)x(\d+)_rgb565_be\.raw$', re.IGNORECASE)
+# Per-codec level tiers; -l also accepts a plain integer level.
+CODECS = {
+    #        suffix   min max  tiers
+    "zlib": (".zlib", 0, 9,  {"fast": 1, "balanced": 6, "max": 9}),
+    "isal": (".zlib", 0, 3,  {"fast": 0, "balanced": 2, "max": 3}),
+    "zstd": (".zst",  1, 22, {"fast": 3, "balanced": 15, "max": 22}),
+}
+DEFAULT_TIER = {"zlib": "max", "isal": "max", "zstd": "balanced"}
+
+# Match names like: alien1_240x240_rgb565_be.raw (case-insensitive)
+RAW_SUFFIX = "_rgb565_be.raw"
 
 def size_from_name(p: pathlib.Path):
-    m = RAW_RE.search(p.name)
-    if not m:
+    n = p.name.lower()
+    if not n.endswith(RAW_SUFFIX):
+        return None
+    _, sep, tail = n[:-len(RAW_SUFFIX)].rpartition("_")
+    if not sep:
+        return None
+    w, _, h = tail.partition("x")
+    if not (w.isdecimal() and h.isdecimal()):
+        return None
+    return int(w), int(h)
+
+def resolve_level(codec: str, level: str):
+    _, lo, hi, tiers = CODECS[codec]
+    if level is None:
+        level = DEFAULT_TIER[codec]
+    if level in tiers:
+        return tiers[level]
+    try:
+        n = int(level)
+    except ValueError:
         return None
-    return int(m.group(1)), int(m.group(2))
+    return n if lo <= n <= hi else None
 
-def compress_one(path: pathlib.Path, level: int, force: bool, overwrite: bool) -> bool:
+def compress(data, codec: str, level: int) -> bytes:
+    if codec == "zstd":
+        # Optional dependency: pip install zstandard
+        import zstandard as zstd
+        return zstd.ZstdCompressor(level=level, threads=-1).compress(data)
+    z = isal_zlib if codec == "isal" else zlib
+    return z.compress(data, level)
+
+def compress_one(path: pathlib.Path, level: int, force: bool, overwrite: bool, codec: str = "zlib",
+                 rebuild: bool = False):
+    """Compress one .raw file. Returns (ok, msg); runs in a worker process, so the caller prints."""
     wh = size_from_name(path)
     if wh is None:
-        print(f"skip: {path.name} (name must end with _<W>x<H>_rgb565_be.raw)")
-        return False
+        return False, f"skip: {path.name} (name must end with _<W>x<H>_rgb565_be.raw)"
 
     w, h = wh
     expected = w * h * 2
-    data = path.read_bytes()
-    if len(data) != expected and not force:
-        print(f"ERROR: {path.name}: size {len(data)} != {expected} (W={w}, H={h}). Use --force to override.")
-        return False
+    size = path.stat().st_size
+    if size != expected and not force:
+        return False, f"ERROR: {path.name}: size {size} != {expected} (W={w}, H={h}). Use --force to override."
 
-    out = path.with_suffix(path.suffix + ".zlib")
+    out = path.with_suffix(path.suffix + CODECS[codec][0])
     if out.exists() and not overwrite:
-        print(f"skip: {out.name} already exists (use --overwrite to replace)")
-        return True
+        return True, f"skip: {out.name} already exists (use --overwrite to replace)"
+    if out.exists() and not rebuild and out.stat().st_mtime >= path.stat().st_mtime:
+        return True, f"up-to-date: {out.name} (may be stale after a -l/-c change; use --rebuild to recompress)"
 
-    comp = zlib.compress(data, level=level)
+    if size == 0:
+        comp = compress(b"", codec, level)  # mmap can't map an empty file
+    else:
+        # Map the input read-only; both codecs take buffer objects, so no copy into Python memory
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            comp = compress(mm, codec, level)
     out.write_bytes(comp)
-    ratio = (len(comp) / len(data)) if len(data) else 1.0
-    print(f"ok: {path.name} -> {out.name}  {len(data)} -> {len(comp)} bytes ({ratio:.2%})")
-    return True
+    ratio = (len(comp) / size) if size else 1.0
+    return True, f"ok: {path.name} -> {out.name}  {size} -> {len(comp)} bytes ({ratio:.2%})"
+
+def _compress_safe(path: pathlib.Path, **kw):
+    try:
+        return compress_one(path, **kw)
+    except Exception as e:
+        return False, f"fail: {path.name}: {e}"
 
 def main():
-    ap = argparse.ArgumentParser(description="Zlib-compress RGB565 BE .raw files in this folder to .raw.zlib")
-    ap.add_argument("-l", "--level", type=int, default=9, help="compression level 0..9 (default 9)")
+    ap = argparse.ArgumentParser(description="Compress RGB565 BE .raw files in this folder to .raw.zlib (or .raw.zst)")
+    ap.add_argument("-c", "--codec", choices=sorted(CODECS), default="zlib",
+                    help="zlib (default, what the firmware decodes), isal (faster zlib-compatible .zlib, "
+                         "needs: pip install isal) or zstd (.zst, needs: pip install zstandard)")
+    ap.add_argument("-l", "--level", default=None,
+                    help="fast|balanced|max or a codec level: zlib 0..9 (default max=9), isal 0..3 (default max=3), "
+                         "zstd 1..22 (default balanced=15)")
     ap.add_argument("-f", "--force", action="store_true", help="ignore size check (W*H*2) derived from filename")
-    ap.add_argument("-o", "--overwrite", action="store_true", help="overwrite existing .zlib files")
+    ap.add_argument("-o", "--overwrite", action="store_true", help="overwrite existing .zlib/.zst files")
+    ap.add_argument("-B", "--rebuild", action="store_true",
+                    help="with --overwrite, recompress even if the output is newer than the .raw (e.g. after changing -l/-c)")
     ap.add_argument("-r", "--recursive", action="store_true", help="recurse into subdirectories")
     args = ap.parse_args()
 
-    if args.level < 0 or args.level > 9:
-        print("compression level must be 0..9")
+    level = resolve_level(args.codec, args.level)
+    if level is None:
+        _, lo, hi, tiers = CODECS[args.codec]
+        print(f"{args.codec} compression level must be {'|'.join(tiers)} or {lo}..{hi}")
+        sys.exit(2)
+
+    if args.codec == "isal" and isal_zlib is None:
+        print("isal codec needs the isal package: pip install isal")
         sys.exit(2)
+    if args.codec == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            print("zstd codec needs the zstandard package: pip install zstandard")
+            sys.exit(2)
 
     base = pathlib.Path(__file__).parent.resolve()
     files = sorted((base.rglob if args.recursive else base.glob)("*.raw"))
@@ -59,13 +132,14 @@ def main():
         print("no *.raw files found in this folder.")
         sys.exit(1)
 
+    # Files are independent and deflate is CPU-bound: one worker per core.
+    job = functools.partial(_compress_safe, level=level, force=args.force,
+                            overwrite=args.overwrite, codec=args.codec, rebuild=args.rebuild)
     ok = 0
-    for f in files:
-        try:
-            if compress_one(f, args.level, args.force, args.overwrite):
-                ok += 1
-        except Exception as e:
-            print(f"fail: {f.name}: {e}")
+    with ProcessPoolExecutor() as ex:
+        for done, msg in ex.map(job, files):
+            print(msg)
+            ok += done
 
     print(f"done: {ok}/{len(files)} files processed.")
     sys.exit(0 if ok == len(files) else 1)